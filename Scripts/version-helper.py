@@ -20,58 +20,84 @@ Examples:
 import argparse
 import os
 import re
+import subprocess
 import xml.etree.ElementTree as ET
 from datetime import datetime
 from pathlib import Path
 from typing import List, Tuple, Optional
 import json
 
+_VERSION_FORMAT = re.compile(r'^\d+\.\d+\.\d+$')
+_VERSION_ELEMENT = re.compile(r'<(Major|Minor|Patch)Version>\d+</\1Version>')
+_FIRST_PROPERTY_GROUP = re.compile(r'(<PropertyGroup>)')
+_SKIPPED_DIRS = frozenset(('bin', 'obj'))
+
+
+def _iter_files(root: Path, suffix: str):
+    """Yield paths of files ending with suffix, pruning bin/obj directories"""
+    stack = [str(root)]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in _SKIPPED_DIRS:
+                            stack.append(entry.path)
+                    elif entry.name.endswith(suffix):
+                        yield entry.path
+        except OSError:
+            continue
+
 
 class VersionHelper:
     def __init__(self, root_dir: str = None):
         self.root_dir = Path(root_dir) if root_dir else Path(__file__).parent.parent
         self.project_files = []
+        self._props_path = self.root_dir / "Ecliptix.Core" / "Directory.Build.props"
+        self._props_tree = self._parse_props()
         self._find_project_files()
     
     def _find_project_files(self):
         """Find all .csproj files in the solution"""
-        for csproj in self.root_dir.rglob("*.csproj"):
-            if "bin" not in str(csproj) and "obj" not in str(csproj):
-                self.project_files.append(csproj)
-        
+        self.project_files = sorted(Path(path) for path in _iter_files(self.root_dir, ".csproj"))
+
         print(f"Found {len(self.project_files)} project files:")
         for proj in self.project_files:
             print(f"  - {proj.relative_to(self.root_dir)}")
-    
+
+    def _parse_props(self) -> Optional[ET.ElementTree]:
+        """Parse Directory.Build.props once, returning None if missing or invalid"""
+        if not self._props_path.exists():
+            return None
+
+        try:
+            return ET.parse(self._props_path)
+        except (ET.ParseError, OSError) as e:
+            print(f"Error parsing Directory.Build.props: {e}")
+            return None
+
     def get_current_version(self) -> str:
         """Get current version from Directory.Build.props"""
-        directory_build_props = self.root_dir / "Ecliptix.Core" / "Directory.Build.props"
-        if not directory_build_props.exists():
-            return "0.1.0"
-        
-        try:
-            tree = ET.parse(directory_build_props)
-            root = tree.getroot()
-            
-            major = minor = patch = "0"
-            
-            for property_group in root.findall("PropertyGroup"):
-                major_elem = property_group.find("MajorVersion")
-                minor_elem = property_group.find("MinorVersion") 
-                patch_elem = property_group.find("PatchVersion")
-                
-                if major_elem is not None and major_elem.text:
-                    major = major_elem.text
-                if minor_elem is not None and minor_elem.text:
-                    minor = minor_elem.text
-                if patch_elem is not None and patch_elem.text:
-                    patch = patch_elem.text
-            
-            return f"{major}.{minor}.{patch}"
-        except Exception as e:
-            print(f"Error reading version: {e}")
+        if self._props_tree is None:
             return "0.1.0"
-    
+
+        major = minor = patch = "0"
+
+        for property_group in self._props_tree.getroot().findall("PropertyGroup"):
+            major_elem = property_group.find("MajorVersion")
+            minor_elem = property_group.find("MinorVersion")
+            patch_elem = property_group.find("PatchVersion")
+
+            if major_elem is not None and major_elem.text:
+                major = major_elem.text
+            if minor_elem is not None and minor_elem.text:
+                minor = minor_elem.text
+            if patch_elem is not None and patch_elem.text:
+                patch = patch_elem.text
+
+        return f"{major}.{minor}.{patch}"
+
     def _get_main_project(self) -> Optional[Path]:
         """Get the main UI project file"""
         for proj in self.project_files:
@@ -109,30 +135,34 @@ class VersionHelper:
     def set_version(self, version: str):
         """Set version in Directory.Build.props"""
         # Validate version format
-        if not re.match(r'^\d+\.\d+\.\d+$', version):
+        if not _VERSION_FORMAT.match(version):
             raise ValueError(f"Invalid version format: {version}. Use x.y.z format")
         
-        directory_build_props = self.root_dir / "Ecliptix.Core" / "Directory.Build.props"
-        if not directory_build_props.exists():
-            raise FileNotFoundError(f"Directory.Build.props not found at {directory_build_props}")
+        if not self._props_path.exists():
+            raise FileNotFoundError(f"Directory.Build.props not found at {self._props_path}")
         
         parts = version.split('.')
         major, minor, patch = parts[0], parts[1], parts[2]
         
         try:
             # Read file content
-            with open(directory_build_props, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = self._props_path.read_bytes().decode('utf-8')
             
             # Update version components
-            content = re.sub(r'<MajorVersion>\d+</MajorVersion>', f'<MajorVersion>{major}</MajorVersion>', content)
-            content = re.sub(r'<MinorVersion>\d+</MinorVersion>', f'<MinorVersion>{minor}</MinorVersion>', content)
-            content = re.sub(r'<PatchVersion>\d+</PatchVersion>', f'<PatchVersion>{patch}</PatchVersion>', content)
-            
-            # Write back to file
-            with open(directory_build_props, 'w', encoding='utf-8') as f:
-                f.write(content)
+            values = {"Major": major, "Minor": minor, "Patch": patch}
+            content = _VERSION_ELEMENT.sub(
+                lambda m: f'<{m.group(1)}Version>{values[m.group(1)]}</{m.group(1)}Version>', content)
             
+            # Write back to file; text edits keep the file's comments and formatting,
+            # which ElementTree.write would drop
+            self._props_path.write_bytes(content.encode('utf-8'))
+
+            # Refresh the cached tree from the text just written
+            try:
+                self._props_tree = ET.ElementTree(ET.fromstring(content))
+            except ET.ParseError:
+                self._props_tree = None
+
             print(f"Updated version to {version} in Directory.Build.props")
                 
         except Exception as e:
@@ -140,13 +170,11 @@ class VersionHelper:
     
     def _add_assembly_version_to_project(self, content: str, version: str) -> str:
         """Add AssemblyVersion to project file if it doesn't exist"""
-        # Find the first PropertyGroup
-        pattern = r'(<PropertyGroup>)'
-        
         def replacement(match):
             return f'{match.group(1)}\n    <AssemblyVersion>{version}</AssemblyVersion>'
         
-        return re.sub(pattern, replacement, content, count=1)
+        # Insert into the first PropertyGroup
+        return _FIRST_PROPERTY_GROUP.sub(replacement, content, count=1)
     
     def generate_build_number(self) -> str:
         """Generate build number using timestamp"""
@@ -158,14 +186,15 @@ class VersionHelper:
         """Create build information dictionary"""
         current_version = self.get_current_version()
         build_number = self.generate_build_number()
+        git_commit, git_branch = self._get_git_info()
         
         build_info = {
             "version": current_version,
             "build_number": build_number,
             "full_version": f"{current_version}-build.{build_number}",
             "timestamp": datetime.now().isoformat(),
-            "git_commit": self._get_git_commit(),
-            "git_branch": self._get_git_branch()
+            "git_commit": git_commit,
+            "git_branch": git_branch
         }
         
         # Write to build-info.json
@@ -176,25 +205,19 @@ class VersionHelper:
         print(f"Created build info: {build_info_file}")
         return build_info
     
-    def _get_git_commit(self) -> str:
-        """Get current git commit hash"""
-        try:
-            import subprocess
-            result = subprocess.run(['git', 'rev-parse', 'HEAD'], 
-                                  capture_output=True, text=True, cwd=self.root_dir)
-            return result.stdout.strip()[:8] if result.returncode == 0 else "unknown"
-        except:
-            return "unknown"
-    
-    def _get_git_branch(self) -> str:
-        """Get current git branch"""
+    def _get_git_info(self) -> Tuple[str, str]:
+        """Get current git commit hash and branch with a single git call"""
         try:
-            import subprocess
-            result = subprocess.run(['git', 'rev-parse', '--abbrev-ref', 'HEAD'], 
-                                  capture_output=True, text=True, cwd=self.root_dir)
-            return result.stdout.strip() if result.returncode == 0 else "unknown"
-        except:
-            return "unknown"
+            result = subprocess.run(['git', 'rev-parse', 'HEAD', '--abbrev-ref', 'HEAD'],
+                                  capture_output=True, cwd=self.root_dir)
+        except OSError:
+            return "unknown", "unknown"
+
+        # Branch names are arbitrary bytes; decode leniently rather than with the locale codec
+        lines = result.stdout.decode('utf-8', errors='replace').splitlines()
+        if result.returncode != 0 or len(lines) < 2:
+            return "unknown", "unknown"
+        return lines[0][:8], lines[1]
 
 
 def main():